@@ -11,6 +11,28 @@ load_dotenv()
 # Generic Config
 TIMEOUT = 30
 BATCH_SIZE = 15
+BATCH_DELAY = 1  # Seconds slept between generation batches
+MAX_WORKERS = 8  # Concurrent WordPress REST / sitemap requests
+PREVIEW_ROWS = 50  # Most recent rows shown in the live results table
+CLIENT_CACHE_SIZE = 32  # Pooled API clients kept alive across sessions (least recently used are closed)
+
+# Existing meta scoring (character ranges)
+SKIP_ACCEPTABLE_META = True  # Only generate where current Yoast meta is missing or weak
+TITLE_LENGTH = (30, 60)
+DESCRIPTION_LENGTH = (120, 160)
+
+# URL filtering and prioritization (regexes matched case-insensitively against the URL path)
+URL_INCLUDE_PATTERNS = []  # Empty includes every URL
+URL_EXCLUDE_PATTERNS = [
+    r"/thank-?you(/|$)",
+    r"/(privacy|cookie|refund|return)-polic(y|ies)(/|$)",
+    r"/(terms(-and-conditions|-of-(use|service))?|legal-notice|disclaimer|imprint)(/|$)",
+    r"/(cart|checkout|my-account)(/|$)",
+    r"/page/\d+(/|$)",
+    r"/(sample-page|hello-world)(/|$)"
+]
+SKIP_NOINDEX = True
+MAX_URLS = None  # Optional cap on pages generated per job, highest priority first
 
 # OpenAI Config
 OPENAI_API_KEY = st.secrets["OPENAI_API_KEY"]
@@ -18,6 +40,14 @@ MODEL_NAME = "gpt-4.1"
 MAX_RETRIES = 3
 RETRY_DELAY = 5
 
+# OpenAI rate limits, pricing (USD per 1M tokens) and speed used by the job planner
+REQUESTS_PER_MINUTE = 500
+TOKENS_PER_MINUTE = 30000
+INPUT_COST_PER_MILLION = 2.00
+OUTPUT_COST_PER_MILLION = 8.00
+OUTPUT_TOKENS_PER_SECOND = 60
+REQUEST_OVERHEAD = 1.0  # Seconds of latency per request before output starts
+
 # Google Sheets Config
 SHEET_TITLE = "MTMD"
 SCOPES = [
@@ -25,7 +55,4 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive"
 ]
 
-SERVICE_ACCOUNT_FILE = "service_account.json"
-
-with open(SERVICE_ACCOUNT_FILE, "w") as f:
-    json.dump(json.loads(st.secrets["SERVICE_ACCOUNT_JSON"]), f)
\ No newline at end of file
+SERVICE_ACCOUNT_INFO = json.loads(st.secrets["SERVICE_ACCOUNT_JSON"])
\ No newline at end of file
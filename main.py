@@ -1,10 +1,9 @@
-import time
 import pandas as pd
 import streamlit as st
-from services.wordpress import WordPressService
-from services.openai_service import OpenAIService
 from services.google_sheets import GoogleSheetsService
-from config import BATCH_SIZE
+from pipeline import CSV_COLUMNS, batch_process, results_to_csv
+from planner import plan_job
+from config import SKIP_ACCEPTABLE_META, PREVIEW_ROWS
 from utils.logger import logger
 
 # Set page config
@@ -148,66 +147,8 @@ if 'completed' not in st.session_state:
     st.session_state.completed = False
 if 'error' not in st.session_state:
     st.session_state.error = None
-
-def batch_process(site_url: str, username: str, application_password: str):
-    """Main processing pipeline"""
-    logger.info("Starting meta generation process")
-    
-    # Initialize services
-    gpt = OpenAIService()
-    wp_service = WordPressService(site_url, username, application_password)
-    
-    # Step 1: Fetch all pages
-    logger.info("Fetching sitemap URLs...")
-    urls = wp_service.fetch_sitemap_urls()
-    logger.info(f"Found {len(urls)} pages")
-    
-    # Step 2: Get WordPress page IDs
-    logger.info("Mapping URLs to page IDs...")
-    page_ids, cleaned_aboutus_text = wp_service.get_page_ids_and_about_us_content(urls)
-    logger.info("URLs mapped to page IDs...")
-
-    # Step 3: Summarize AboutUs page content
-    logger.info("Summarizing About us page content")
-    summarized_about_us_text = gpt.summarize_about_content(cleaned_aboutus_text)
-    logger.info("Summarized About us page content successfully")
-    
-    # Step 4: Process in batches
-    results = []
-    total_urls = len(urls)
-    
-    for i in range(0, total_urls, BATCH_SIZE):
-        batch = urls[i:i+BATCH_SIZE]
-        logger.info(f"Processing batch {i//BATCH_SIZE + 1}/{(total_urls//BATCH_SIZE)+1}")
-
-        # Generate meta for batch
-        meta_data = gpt.generate_meta_batch(batch, summarized_about_us_text)
-        
-        # Prepare results
-        for url in batch:
-            title, desc = meta_data.get(url, ("N/A", "N/A"))
-            results.append({
-                "post_id": page_ids.get(url, "N/A"),
-                "url": url,
-                "post_type": "page",
-                "_yoast_wpseo_title": title,
-                "_yoast_wpseo_metadesc": desc
-            })
-        
-        # Rate limiting (adjust based on gpt's rate limits)
-        if i + BATCH_SIZE < total_urls:
-            time.sleep(1)  # Small delay between batches
-    
-    # Step 5: Create Google Sheet
-    logger.info("Creating CSV File...")
-
-    df = pd.DataFrame(results)
-    df = df[["post_id", "post_type", "_yoast_wpseo_title", "_yoast_wpseo_metadesc", "url"]]
-    csv = df.to_csv(index=False).encode('utf-8')
-    
-    logger.info("CSV created successfully!")
-
-    return csv
+if 'partial_rows' not in st.session_state:
+    st.session_state.partial_rows = []
 
 def show_progress():
     progress = (st.session_state.current_step - 1) / 3
@@ -344,6 +285,29 @@ def step_email():
                 else:
                     st.session_state.error = "Please enter a valid email address"
 
+def show_plan(plan):
+    """Display a dry-run job estimate"""
+    st.subheader("Estimate")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pages", plan["urls"])
+    col2.metric("API calls", plan["api_calls"])
+    col3.metric("Est. cost", f'${plan["cost"]:.2f}')
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Input tokens", f'{plan["input_tokens"]:,}')
+    col2.metric("Output tokens", f'{plan["output_tokens"]:,}')
+    col3.metric("Est. time", format_duration(plan["total_seconds"]))
+
+    if plan["skipped_urls"]:
+        st.markdown(f'<p class="info-text">{plan["skipped_urls"]} pages are filtered out or already have acceptable meta and will be skipped.</p>', unsafe_allow_html=True)
+
+    if plan["excluded_urls"]:
+        with st.expander(f'{len(plan["excluded_urls"])} URLs excluded by URL filters or noindex'):
+            st.write("\n".join(f"- {url}" for url in plan["excluded_urls"]))
+
+    if plan["rate_limited"]:
+        st.markdown('<p class="info-text">Runtime is bound by the OpenAI rate limits.</p>', unsafe_allow_html=True)
+
 def step_review():
     st.title("Review & Generate")
     show_progress()
@@ -357,8 +321,43 @@ def step_review():
         
         st.subheader("WordPress Username")
         st.write(st.session_state.form_data.get('username', ''))
+
+        st.session_state.form_data['skip_acceptable_meta'] = st.checkbox(
+            "Only generate where existing meta is missing or weak",
+            value=st.session_state.form_data.get('skip_acceptable_meta', SKIP_ACCEPTABLE_META),
+            key="skip_acceptable_meta",
+            help="Pages whose current Yoast title and description are unique and within recommended lengths are left out"
+        )
+
+        # An estimate computed for another site, user or mode no longer applies
+        plan = st.session_state.get('plan')
+        form_data = st.session_state.form_data
+        if plan and (
+            plan["site_url"] != form_data.get('website_url')
+            or plan["username"] != form_data.get('username')
+            or plan["skip_acceptable_meta"] != form_data['skip_acceptable_meta']
+        ):
+            st.session_state.plan = None
         
         st.markdown('</div>', unsafe_allow_html=True)
+
+        if st.button("Estimate Cost & Time"):
+            form_data = st.session_state.form_data
+            with st.spinner("Scanning your site..."):
+                try:
+                    st.session_state.plan = plan_job(
+                        site_url=form_data["website_url"],
+                        username=form_data["username"],
+                        application_password=form_data["app_password"],
+                        skip_acceptable_meta=form_data["skip_acceptable_meta"]
+                    )
+                except Exception as e:
+                    logger.error(f"Planning error: {str(e)}")
+                    st.session_state.error = handle_error(e)
+                    st.rerun()
+
+        if st.session_state.get('plan'):
+            show_plan(st.session_state.plan)
         
         col1, col2 = st.columns(2)
         with col1:
@@ -370,6 +369,45 @@ def step_review():
                 st.session_state.processing = True
                 st.rerun()
 
+def format_duration(seconds):
+    """Format seconds as a short human-readable duration"""
+    if seconds is None:
+        return "—"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+def render_progress(update, status, bar, metrics, table, download):
+    """Render one pipeline progress snapshot into the processing page placeholders"""
+    status.write(update["message"])
+
+    if update["stage"] == "discovery":
+        return
+
+    bar.progress(update["processed"] / update["total"] if update["total"] else 1.0)
+
+    with metrics.container():
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Pages", f'{update["processed"]}/{update["total"]}')
+        col2.metric("Pages / min", f'{update["throughput"]:.1f}')
+        col3.metric("ETA", format_duration(update["eta"]))
+
+    if not update["rows"]:
+        return
+
+    rows = st.session_state.partial_rows
+    table.dataframe(pd.DataFrame(rows[-PREVIEW_ROWS:], columns=CSV_COLUMNS), hide_index=True)
+
+    # Fresh key per batch so the button always serves every row finished so far
+    with download.container():
+        st.download_button(
+            label=f"📥 Download Partial CSV ({len(rows)} rows)",
+            data=results_to_csv(rows),
+            file_name="meta_data_partial.csv",
+            mime="text/csv",
+            key=f"partial_csv_{update['batch']}",
+            on_click="ignore"
+        )
+
 def step_processing():
     st.title("Processing")
     show_progress()
@@ -377,19 +415,30 @@ def step_processing():
     with st.container():
         
         st.header("Generating your meta data")
-        st.write("This may take a few minutes...")
-        
-        st.markdown('<div class="loader"><div class="spinner"></div></div>', unsafe_allow_html=True)
+        status = st.empty()
+        loader = st.empty()
+        loader.markdown('<div class="loader"><div class="spinner"></div></div>', unsafe_allow_html=True)
+        bar = st.empty()
+        metrics = st.empty()
+        download = st.empty()
+        table = st.empty()
         
         try:
             form_data = st.session_state.form_data
-            csv = batch_process(
+            st.session_state.partial_rows = []
+            st.session_state.partial_csv = None
+            for update in batch_process(
                 site_url=form_data["website_url"],
                 username=form_data["username"],
-                application_password=form_data["app_password"]
-            )
+                application_password=form_data["app_password"],
+                skip_acceptable_meta=form_data.get("skip_acceptable_meta", SKIP_ACCEPTABLE_META)
+            ):
+                if update["stage"] != "discovery":
+                    loader.empty()
+                st.session_state.partial_rows.extend(update["rows"])
+                render_progress(update, status, bar, metrics, table, download)
             
-            st.session_state.csv = csv
+            st.session_state.csv = results_to_csv(st.session_state.partial_rows)
             st.session_state.processing = False
             st.session_state.completed = True
             st.rerun()
@@ -397,6 +446,8 @@ def step_processing():
         except Exception as e:
             logger.error(f"Processing error: {str(e)}")
             st.session_state.error = handle_error(e)
+            if st.session_state.partial_rows:
+                st.session_state.partial_csv = results_to_csv(st.session_state.partial_rows)
             st.session_state.processing = False
             st.rerun()
         
@@ -439,6 +490,8 @@ def step_download():
             if st.button("Start New Request"):
                 st.session_state.current_step = 1
                 st.session_state.form_data = {}
+                st.session_state.plan = None
+                st.session_state.partial_csv = None
                 st.session_state.completed = False
                 st.rerun()
 
@@ -446,6 +499,16 @@ def step_download():
 if st.session_state.error:
     st.markdown(f'<div class="error-box">{st.session_state.error}</div>', unsafe_allow_html=True)
 
+    # Keep whatever finished before a failed run
+    if st.session_state.get('partial_csv'):
+        st.download_button(
+            label="📥 Download Partial CSV",
+            data=st.session_state.partial_csv,
+            file_name="meta_data_partial.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
 if st.session_state.processing:
     step_processing()
 elif st.session_state.completed:
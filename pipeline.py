@@ -0,0 +1,154 @@
+import math
+import time
+import pandas as pd
+from typing import Dict, Generator, Iterator, List, Tuple
+from services.wordpress import WordPressService
+from services.openai_service import OpenAIService
+from config import BATCH_SIZE, BATCH_DELAY, SKIP_ACCEPTABLE_META, MAX_URLS
+from utils.logger import logger
+from utils.meta_scorer import select_urls_needing_meta
+from utils.url_filter import UrlFilter
+
+EXCLUDED_LOG_SAMPLE = 10  # Excluded URLs named in the log; the full list is shown in the UI
+
+CSV_COLUMNS = ["post_id", "post_type", "_yoast_wpseo_title", "_yoast_wpseo_metadesc", "url"]
+
+def results_to_csv(results: List[Dict]) -> bytes:
+    """Build the import-ready CSV from (possibly partial) result rows"""
+    df = pd.DataFrame(results, columns=CSV_COLUMNS)
+    return df.to_csv(index=False).encode('utf-8')
+
+def select_urls(entries: List[Dict], post_ids: Dict[str, Dict],
+                skip_acceptable_meta: bool = SKIP_ACCEPTABLE_META) -> Tuple[List[str], List[str]]:
+    """Pre-generation stage: drop filtered and noindex URLs, order by priority and cap the job; also returns the excluded URLs"""
+    urls, excluded = UrlFilter().apply(entries, post_ids)
+    if excluded:
+        sample = ", ".join(excluded[:EXCLUDED_LOG_SAMPLE])
+        more = f" and {len(excluded) - EXCLUDED_LOG_SAMPLE} more" if len(excluded) > EXCLUDED_LOG_SAMPLE else ""
+        logger.info(f"Excluded {len(excluded)} URLs by URL filters / noindex: {sample}{more}")
+    if skip_acceptable_meta:
+        urls = select_urls_needing_meta(urls, post_ids)
+    return (urls[:MAX_URLS] if MAX_URLS else urls), excluded
+
+def _progress(stage: str, message: str, new_rows: List[Dict] = None, processed: int = 0, total: int = 0,
+              batch: int = 0, total_batches: int = 0, started_at: float = None) -> Dict:
+    """Snapshot of pipeline progress with throughput (pages/min), ETA (seconds) and the rows added since the last snapshot"""
+    elapsed = time.time() - started_at if started_at else 0.0
+    throughput = processed / elapsed * 60 if elapsed and processed else 0.0
+    eta = (total - processed) / throughput * 60 if throughput else None
+
+    return {
+        "stage": stage,
+        "message": message,
+        "batch": batch,
+        "total_batches": total_batches,
+        "processed": processed,
+        "total": total,
+        "elapsed": elapsed,
+        "throughput": throughput,
+        "eta": eta,
+        "rows": new_rows or []
+    }
+
+def discover(wp_service: WordPressService, skip_acceptable_meta: bool = SKIP_ACCEPTABLE_META) -> Generator[Dict, None, Dict]:
+    """Discovery stages shared by batch_process and the planner; yields progress snapshots and returns the selected job"""
+    # Step 1: Discover public post types
+    logger.info("Discovering post types...")
+    yield _progress("discovery", "Discovering post types...")
+    post_types = wp_service.get_post_types()
+    logger.info(f"Found post types: {', '.join(post_types)}")
+
+    # Step 2: Fetch all URLs for those post types
+    logger.info("Fetching sitemap URLs...")
+    yield _progress("discovery", "Fetching sitemap URLs...")
+    entries = wp_service.fetch_sitemap_entries(post_types=post_types)
+    urls = [entry["url"] for entry in entries]
+    logger.info(f"Found {len(urls)} URLs")
+
+    # Step 3: Get WordPress post IDs and types
+    logger.info("Mapping URLs to post IDs...")
+    yield _progress("discovery", f"Mapping {len(urls)} URLs to post IDs...", total=len(urls))
+    post_ids, cleaned_aboutus_text = wp_service.get_post_ids_and_about_us_content(urls, post_types)
+    logger.info(f"Mapped {len(post_ids)} URLs to post IDs...")
+
+    # Step 4: Filter, prioritize and skip pages whose existing Yoast meta is already acceptable
+    urls, excluded = select_urls(entries, post_ids, skip_acceptable_meta)
+    logger.info(f"{len(urls)} of {len(entries)} URLs selected for generation")
+    yield _progress(
+        "discovery", f"{len(urls)} of {len(entries)} URLs need new meta ({len(excluded)} excluded by URL filters or noindex)",
+        total=len(urls)
+    )
+
+    return {
+        "post_types": post_types,
+        "entries": entries,
+        "post_ids": post_ids,
+        "about_us_text": cleaned_aboutus_text,
+        "urls": urls,
+        "excluded_urls": excluded
+    }
+
+def batch_process(site_url: str, username: str, application_password: str,
+                  skip_acceptable_meta: bool = SKIP_ACCEPTABLE_META) -> Iterator[Dict]:
+    """Main processing pipeline, yielding a progress snapshot after each stage and batch"""
+    logger.info("Starting meta generation process")
+
+    # Initialize services
+    gpt = OpenAIService()
+    wp_service = WordPressService(site_url, username, application_password)
+
+    # Steps 1-4: Discovery and URL selection
+    job = yield from discover(wp_service, skip_acceptable_meta)
+    urls, post_ids = job["urls"], job["post_ids"]
+
+    # Step 5: Summarize AboutUs page content
+    if urls:
+        logger.info("Summarizing About us page content")
+        yield _progress("discovery", "Summarizing About us page content...", total=len(urls))
+        summarized_about_us_text = gpt.summarize_about_content(job["about_us_text"])
+        logger.info("Summarized About us page content successfully")
+
+    # Step 6: Process in batches
+    processed = 0
+    total_urls = len(urls)
+    total_batches = math.ceil(total_urls / BATCH_SIZE)
+    started_at = time.time()
+
+    for i in range(0, total_urls, BATCH_SIZE):
+        batch = urls[i:i+BATCH_SIZE]
+        batch_number = i//BATCH_SIZE + 1
+        logger.info(f"Processing batch {batch_number}/{total_batches}")
+
+        # Generate meta for batch
+        meta_data = gpt.generate_meta_batch(batch, summarized_about_us_text)
+
+        # Prepare results
+        batch_rows = []
+        for url in batch:
+            title, desc = meta_data.get(url, ("N/A", "N/A"))
+            post = post_ids.get(url, {})
+            batch_rows.append({
+                "post_id": post.get("post_id", "N/A"),
+                "url": url,
+                "post_type": post.get("post_type", "N/A"),
+                "_yoast_wpseo_title": title,
+                "_yoast_wpseo_metadesc": desc
+            })
+
+        processed += len(batch_rows)
+        yield _progress(
+            "generation", f"Processed batch {batch_number}/{total_batches}", batch_rows,
+            processed=processed, total=total_urls,
+            batch=batch_number, total_batches=total_batches, started_at=started_at
+        )
+
+        # Rate limiting (adjust based on gpt's rate limits)
+        if i + BATCH_SIZE < total_urls:
+            time.sleep(BATCH_DELAY)  # Small delay between batches
+
+    logger.info("Meta generation completed successfully!")
+    yield _progress(
+        "done", "Meta generation completed",
+        processed=processed, total=total_urls,
+        batch=total_batches, total_batches=total_batches, started_at=started_at
+    )
@@ -0,0 +1,113 @@
+import math
+import time
+import tiktoken
+from typing import Dict, List
+from services.wordpress import WordPressService
+from services.openai_service import OpenAIService, SUMMARY_SYSTEM_MESSAGE
+from config import (
+    BATCH_SIZE, BATCH_DELAY, MODEL_NAME, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE, INPUT_COST_PER_MILLION,
+    OUTPUT_COST_PER_MILLION, OUTPUT_TOKENS_PER_SECOND, REQUEST_OVERHEAD, SKIP_ACCEPTABLE_META
+)
+from pipeline import discover
+from utils.logger import logger
+
+# Chat format overhead (OpenAI cookbook): per message, plus priming of the reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Expected model output: summary length and one JSON entry per URL (~60 char title, ~160 char description)
+ESTIMATED_SUMMARY_TOKENS = 300
+ESTIMATED_META_TOKENS_PER_URL = 60
+
+def _get_encoding() -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(MODEL_NAME)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def count_message_tokens(encoding: tiktoken.Encoding, messages: List[Dict[str, str]]) -> int:
+    """Count prompt tokens for a chat completion request"""
+    tokens = TOKENS_PER_REPLY
+    for message in messages:
+        tokens += TOKENS_PER_MESSAGE + len(encoding.encode(message["content"]))
+    return tokens
+
+def _run_discovery(wp_service: WordPressService, skip_acceptable_meta: bool) -> Dict:
+    """Drive the shared discovery stages to completion, ignoring their progress snapshots"""
+    stages = discover(wp_service, skip_acceptable_meta)
+    while True:
+        try:
+            next(stages)
+        except StopIteration as stop:
+            return stop.value
+
+def plan_job(site_url: str, username: str, application_password: str,
+             skip_acceptable_meta: bool = SKIP_ACCEPTABLE_META) -> Dict:
+    """Dry-run a site job: run discovery only and project calls, tokens, cost and runtime"""
+    logger.info("Planning meta generation job")
+    gpt = OpenAIService()
+    wp_service = WordPressService(site_url, username, application_password)
+    encoding = _get_encoding()
+
+    # Discovery stages, exactly as batch_process runs them
+    started_at = time.time()
+    job = _run_discovery(wp_service, skip_acceptable_meta)
+    urls = job["urls"]
+    discovery_seconds = time.time() - started_at
+
+    # About Us summary call, skipped by batch_process when nothing needs generation
+    input_tokens = output_tokens = model_seconds = 0
+    if urls:
+        input_tokens = count_message_tokens(encoding, [
+            {"role": "system", "content": SUMMARY_SYSTEM_MESSAGE},
+            {"role": "user", "content": gpt._build_summary_prompt(job["about_us_text"])}
+        ])
+        output_tokens = ESTIMATED_SUMMARY_TOKENS
+        model_seconds = REQUEST_OVERHEAD + ESTIMATED_SUMMARY_TOKENS / OUTPUT_TOKENS_PER_SECOND
+
+    # Meta batches; the real summary is unknown until generated, so stand in a summary-sized placeholder
+    system_message = gpt._build_meta_system_message(" ".join(["insight"] * ESTIMATED_SUMMARY_TOKENS))
+    total_batches = math.ceil(len(urls) / BATCH_SIZE)
+    for i in range(0, len(urls), BATCH_SIZE):
+        batch = urls[i:i+BATCH_SIZE]
+        input_tokens += count_message_tokens(encoding, [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": gpt._build_prompt(batch)}
+        ])
+        batch_output_tokens = sum(len(encoding.encode(url)) + ESTIMATED_META_TOKENS_PER_URL for url in batch)
+        output_tokens += batch_output_tokens
+        model_seconds += REQUEST_OVERHEAD + batch_output_tokens / OUTPUT_TOKENS_PER_SECOND
+
+    api_calls = total_batches + 1 if urls else 0
+    model_seconds += max(total_batches - 1, 0) * BATCH_DELAY
+
+    # Batches run sequentially, so the account limits only bind when they are slower than the model
+    rate_limit_seconds = max(
+        api_calls / REQUESTS_PER_MINUTE * 60,
+        (input_tokens + output_tokens) / TOKENS_PER_MINUTE * 60
+    )
+    generation_seconds = max(model_seconds, rate_limit_seconds)
+
+    cost = (input_tokens * INPUT_COST_PER_MILLION + output_tokens * OUTPUT_COST_PER_MILLION) / 1_000_000
+
+    plan = {
+        "site_url": site_url,
+        "username": username,
+        "skip_acceptable_meta": skip_acceptable_meta,
+        "post_types": list(job["post_types"]),
+        "urls": len(urls),
+        "skipped_urls": len(job["entries"]) - len(urls),
+        "excluded_urls": job["excluded_urls"],
+        "mapped_urls": len(job["post_ids"]),
+        "api_calls": api_calls,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": cost,
+        "discovery_seconds": discovery_seconds,
+        "generation_seconds": generation_seconds,
+        "total_seconds": discovery_seconds + generation_seconds,
+        "rate_limited": rate_limit_seconds > model_seconds
+    }
+    logger.info(f"Job plan: {plan}")
+
+    return plan
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+import gspread
+import requests
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+from openai import OpenAI
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from config import OPENAI_API_KEY, SERVICE_ACCOUNT_INFO, SCOPES, MAX_WORKERS, CLIENT_CACHE_SIZE
+
+def _fingerprint(secret: str) -> str:
+    """Hash a credential so cache keys never hold it in plaintext"""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+class ClientRegistry:
+    """Bounded, process-wide LRU cache of pooled API clients keyed by tenant credentials"""
+
+    def __init__(self, max_size: int = CLIENT_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._clients: "OrderedDict[Hashable, object]" = OrderedDict()
+
+    def _get_or_create(self, key: Hashable, factory: Callable[[], object]) -> object:
+        with self._lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+
+            client = self._clients[key] = factory()
+
+            # Close least recently used clients so their pools don't outlive the tenant
+            while len(self._clients) > self._max_size:
+                _, evicted = self._clients.popitem(last=False)
+                close = getattr(evicted, "close", None)
+                if callable(close):
+                    close()
+            return client
+
+    def openai(self, api_key: str = OPENAI_API_KEY) -> OpenAI:
+        """OpenAI client (thread-safe, pooled by httpx) for an API key"""
+        return self._get_or_create(("openai", _fingerprint(api_key)), lambda: OpenAI(api_key=api_key))
+
+    def sheets(self, service_account_info: Dict = SERVICE_ACCOUNT_INFO) -> gspread.Client:
+        """Authorized gspread client for a service account"""
+        def factory():
+            creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
+            return gspread.authorize(creds)
+
+        return self._get_or_create(("sheets", service_account_info["client_email"]), factory)
+
+    def wordpress(self, wp_site: str, wp_username: str, wp_application_password: str) -> requests.Session:
+        """Session for a WordPress site, sized for concurrent requests (credentials are passed per REST call)"""
+        # Sharing one session across threads is safe here: it is never mutated after creation
+        # (auth and headers go on each request), the cookie jar is lock-protected and
+        # urllib3's connection pools are thread-safe
+        def factory():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            return session
+
+        key = ("wordpress", wp_site, wp_username, _fingerprint(wp_application_password))
+        return self._get_or_create(key, factory)
+
+registry = ClientRegistry()
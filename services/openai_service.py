@@ -2,42 +2,25 @@ import json
 import time
 from typing import List, Dict, Tuple
 from openai import OpenAI
-from config import OPENAI_API_KEY, MODEL_NAME, MAX_RETRIES, RETRY_DELAY
+from config import MODEL_NAME, MAX_RETRIES, RETRY_DELAY
+from services.client_registry import registry
 from utils.logger import logger
 
+SUMMARY_SYSTEM_MESSAGE = "You are an SEO analyst and an expert in summarizing content to include only the information needed to generate high-quality SEO metadata."
+
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, client: OpenAI = None):
+        self.client = client or registry.openai()
 
     def summarize_about_content(self, about_text: str) -> str:
-        text = about_text
-        prompt = f"""
-        You are an SEO assistant. Analyze the following About Us page content and extract only the key insights that are useful for generating SEO meta titles and descriptions.
-
-        ONLY include:
-        - Business type
-        - Services offered
-        - Location or service area
-        - Unique selling points (USPs)
-        - Tone or brand personality
-        - Anything important for search engine relevance
-
-        Remove any vague marketing fluff or repeated information.
-
-        Here is the About Us content:
-        \"\"\"
-        {text}
-        \"\"\"
-
-        Respond with a concise summary of the key SEO-relevant insights.
-        """
+        prompt = self._build_summary_prompt(about_text)
 
         for attempt in range(MAX_RETRIES):
             try:
                 response = self.client.chat.completions.create(
                     model=MODEL_NAME,
                     messages=[
-                        {"role": "system", "content": "You are an SEO analyst and an expert in summarizing content to include only the information needed to generate high-quality SEO metadata."},
+                        {"role": "system", "content": SUMMARY_SYSTEM_MESSAGE},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.4
@@ -58,7 +41,7 @@ class OpenAIService:
                 response = self.client.chat.completions.create(
                     model=MODEL_NAME,
                     messages=[
-                        {"role": "system", "content": f"You are an SEO expert that returns only JSON. Use this about us page summary to generate high quality SEO meta titles and descriptions: {summarized_aboutus_content}"},
+                        {"role": "system", "content": self._build_meta_system_message(summarized_aboutus_content)},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.7
@@ -72,6 +55,35 @@ class OpenAIService:
 
         return {url: ("N/A", "N/A") for url in urls}
     
+    def _build_summary_prompt(self, about_text: str) -> str:
+        """Construct the prompt for About Us summarization"""
+        prompt = f"""
+        You are an SEO assistant. Analyze the following About Us page content and extract only the key insights that are useful for generating SEO meta titles and descriptions.
+
+        ONLY include:
+        - Business type
+        - Services offered
+        - Location or service area
+        - Unique selling points (USPs)
+        - Tone or brand personality
+        - Anything important for search engine relevance
+
+        Remove any vague marketing fluff or repeated information.
+
+        Here is the About Us content:
+        \"\"\"
+        {about_text}
+        \"\"\"
+
+        Respond with a concise summary of the key SEO-relevant insights.
+        """
+
+        return prompt
+
+    def _build_meta_system_message(self, summarized_aboutus_content: str) -> str:
+        """Construct the system message for batch processing"""
+        return f"You are an SEO expert that returns only JSON. Use this about us page summary to generate high quality SEO meta titles and descriptions: {summarized_aboutus_content}"
+
     def _build_prompt(self, urls: List[str]) -> str:
         """Construct the prompt for batch processing"""
         url_list = "\n".join([f"- {url}" for url in urls])
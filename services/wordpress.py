@@ -1,9 +1,11 @@
 import re
-import requests
+import html
 from requests.auth import HTTPBasicAuth
 import xml.etree.ElementTree as ET
-from typing import Dict, List
-from config import TIMEOUT
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Tuple
+from config import TIMEOUT, MAX_WORKERS
+from services.client_registry import registry
 from utils.logger import logger
 from bs4 import BeautifulSoup
 
@@ -15,71 +17,193 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
 }
 
+# Internal post types exposed by /wp/v2/types that never have front-end URLs
+EXCLUDED_POST_TYPES = {
+    "attachment",
+    "nav_menu_item",
+    "wp_block",
+    "wp_template",
+    "wp_template_part",
+    "wp_navigation",
+    "wp_global_styles",
+    "wp_font_family",
+    "wp_font_face"
+}
+
+# Child sitemap file names: Yoast ("post-sitemap2.xml") and WP core ("wp-sitemap-posts-post-1.xml")
+SITEMAP_NAME_PATTERNS = [
+    re.compile(r"^wp-sitemap-posts-(?P<type>[\w-]+)-\d+\.xml$"),
+    re.compile(r"^(?P<type>[\w-]+?)-sitemap\d*\.xml$")
+]
+
+# WP core child sitemaps for taxonomies and users, which never list posts
+CORE_NON_POST_SITEMAP_PATTERN = re.compile(r"^wp-sitemap-(?:taxonomies|users)-")
+
 class WordPressService:
     def __init__(self, wp_site, wp_username, wp_application_password):
         self.wp_username = wp_username
         self.wp_site = wp_site.rstrip('/')
-        self.wp_sitemap_url = f"{wp_site}/page-sitemap.xml"
+        self.wp_sitemap_url = f"{self.wp_site}/sitemap_index.xml"
+        self.wp_core_sitemap_url = f"{self.wp_site}/wp-sitemap.xml"
         self.wp_application_password = wp_application_password.replace(' ', '')
         self.auth = HTTPBasicAuth(self.wp_username, self.wp_application_password)
+        self.session = registry.wordpress(self.wp_site, self.wp_username, self.wp_application_password)
+
+    def get_post_types(self) -> Dict[str, str]:
+        """Discover public post types and map each slug to its REST collection route"""
+        try:
+            endpoint = f"{self.wp_site}/wp-json/wp/v2/types"
+            response = self.session.get(endpoint, auth=self.auth, headers=HEADERS, timeout=TIMEOUT)
+            response.raise_for_status()
+
+            post_types = {}
+            for slug, type_data in response.json().items():
+                rest_base = type_data.get("rest_base")
+                if slug in EXCLUDED_POST_TYPES or not rest_base:
+                    continue
+                namespace = type_data.get("rest_namespace") or "wp/v2"
+                post_types[slug] = f"{namespace}/{rest_base}"
+
+            if post_types:
+                return post_types
+        except Exception as e:
+            logger.error(f"Post type discovery error: {str(e)}")
+
+        return {"page": "wp/v2/pages"}
     
-    def fetch_sitemap_urls(self) -> List[str]:
-        """Fetch all URLs from WordPress sitemap"""
+    def fetch_sitemap_entries(self, post_types: Iterable[str] = None) -> List[Dict]:
+        """Fetch all URL entries (url, lastmod, priority) from the Yoast sitemap index, or WP core's when Yoast's is missing"""
+        entries = {}
+        for entry in self._fetch_sitemap(self.wp_sitemap_url, post_types, fallback_url=self.wp_core_sitemap_url):
+            entries.setdefault(entry["url"], entry)
+        return list(entries.values())
+
+    def _fetch_sitemap(self, sitemap_url: str, post_types: Iterable[str] = None, fallback_url: str = None) -> List[Dict]:
+        """Fetch and parse one sitemap, trying fallback_url instead if it returns 404"""
         try:
-            response = requests.get(self.wp_sitemap_url, headers=HEADERS, timeout=TIMEOUT*2)
+            response = self.session.get(sitemap_url, headers=HEADERS, timeout=TIMEOUT*2)
+            if response.status_code == 404 and fallback_url:
+                logger.info(f"{sitemap_url} not found, falling back to {fallback_url}")
+                return self._fetch_sitemap(fallback_url, post_types)
             response.raise_for_status()
             root = ET.fromstring(response.content)
-            return self._parse_sitemap(root)
+            return self._parse_sitemap(root, post_types)
         except Exception as e:
             logger.error(f"Sitemap fetch error: {str(e)}")
             return []
     
-    def _parse_sitemap(self, root: ET.Element) -> List[str]:
-        """Parse XML sitemap recursively"""
-        urls = []
+    def _parse_sitemap(self, root: ET.Element, post_types: Iterable[str] = None) -> List[Dict]:
+        """Parse XML sitemap recursively, fetching child sitemaps concurrently"""
+        entries = []
         namespace = {'ns': root.tag.split("}")[0].strip("{")}
         
         if root.tag.endswith("sitemapindex"):
-            for sitemap in root.findall("ns:sitemap", namespace):
-                loc = sitemap.find("ns:loc", namespace).text
-                urls.extend(self.fetch_sitemap_urls(loc))
+            locs = [
+                sitemap.find("ns:loc", namespace).text.strip()
+                for sitemap in root.findall("ns:sitemap", namespace)
+            ]
+            if post_types:
+                locs = [loc for loc in locs if self._is_post_type_sitemap(loc, post_types)]
+
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                for child_entries in executor.map(lambda loc: self._fetch_sitemap(loc, post_types), locs):
+                    entries.extend(child_entries)
         elif root.tag.endswith("urlset"):
             for url in root.findall("ns:url", namespace):
                 loc = url.find("ns:loc", namespace)
                 if loc is not None:
-                    urls.append(loc.text.rstrip('/'))
-        return urls
+                    entries.append({
+                        "url": loc.text.strip().rstrip('/'),
+                        "lastmod": url.findtext("ns:lastmod", default=None, namespaces=namespace),
+                        "priority": url.findtext("ns:priority", default=None, namespaces=namespace)
+                    })
+        return entries
+
+    def _is_post_type_sitemap(self, sitemap_url: str, post_types: Iterable[str]) -> bool:
+        """Check whether a child sitemap belongs to one of the post types (names matching neither Yoast's nor WP core's scheme are kept)"""
+        file_name = sitemap_url.split("?")[0].rstrip('/').rsplit('/', 1)[-1]
+        if CORE_NON_POST_SITEMAP_PATTERN.match(file_name):
+            return False
+        for pattern in SITEMAP_NAME_PATTERNS:
+            match = pattern.match(file_name)
+            if match:
+                return match.group("type") in post_types
+        return True
     
-    def get_page_ids_and_about_us_content(self, urls: List[str]) -> Dict[str, int]:
-        """Get WordPress page IDs for a list of URLs (with pagination) and about us page content"""
-        cleaned_text = ""
-        page_ids = {}
-        page = 1
+    def get_post_ids_and_about_us_content(self, urls: List[str], post_types: Dict[str, str]) -> Tuple[Dict[str, Dict], str]:
+        """Map URLs to post ID, post type, existing Yoast meta and noindex flag across all post types concurrently and get about us page content"""
+        url_set = set(urls)
+        items = []
 
-        try:
-            while True:
-                endpoint = f"{self.wp_site}/wp-json/wp/v2/pages?per_page=100&page={page}"
-                response = requests.get(endpoint, auth=self.auth, headers=HEADERS, timeout=TIMEOUT)
-                response.raise_for_status()
-                
-                data = response.json()
-                if not data:
-                    break  # No more pages
-
-                for page_data in data:
-                    if "about" in page_data['link'].lower() or "about" in page_data['slug'].lower():
-                        raw_html = page_data['content']['rendered']
-                        cleaned_text = self.clean_about_us_text(raw_html)
-                    clean_url = page_data['link'].rstrip('/')
-                    if clean_url in urls:
-                        page_ids[clean_url] = page_data['id']
-
-                page += 1
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # The first page of every type tells us how many pages are left to fetch
+            first_pages = {
+                executor.submit(self._fetch_post_page, route, 1, slug == "page"): slug
+                for slug, route in post_types.items()
+            }
+            remaining_pages = {}
+            for future in as_completed(first_pages):
+                slug = first_pages[future]
+                try:
+                    data, total_pages = future.result()
+                except Exception as e:
+                    logger.error(f"Post ID fetch error ({slug}): {str(e)}")
+                    continue
 
-        except Exception as e:
-            logger.error(f"Page ID fetch error: {str(e)}")
+                items.extend((slug, item) for item in data)
+                for page in range(2, total_pages + 1):
+                    page_future = executor.submit(self._fetch_post_page, post_types[slug], page, slug == "page")
+                    remaining_pages[page_future] = slug
+
+            for future in as_completed(remaining_pages):
+                slug = remaining_pages[future]
+                try:
+                    data, _ = future.result()
+                except Exception as e:
+                    logger.error(f"Post ID fetch error ({slug}): {str(e)}")
+                    continue
+
+                items.extend((slug, item) for item in data)
+
+        post_ids = {}
+        about_pages = []
+        for slug, item in items:
+            clean_url = item['link'].rstrip('/')
+            if clean_url in url_set:
+                yoast_meta = item.get('yoast_head_json') or {}
+                post_ids[clean_url] = {
+                    "post_id": item['id'],
+                    "post_type": slug,
+                    "title": html.unescape(yoast_meta.get("title") or ""),
+                    "post_title": html.unescape((item.get('title') or {}).get('rendered') or ""),
+                    "site_name": html.unescape(yoast_meta.get("og_site_name") or ""),
+                    "description": html.unescape(yoast_meta.get("description") or ""),
+                    "noindex": (yoast_meta.get("robots") or {}).get("index") == "noindex"
+                }
+            if slug == "page" and ("about" in item['link'].lower() or "about" in item['slug'].lower()):
+                about_pages.append(item)
+
+        cleaned_text = ""
+        if about_pages:
+            # Prefer the top-level about page (e.g. /about-us over /about-us/team)
+            about_page = min(about_pages, key=lambda item: len(item['link']))
+            cleaned_text = self.clean_about_us_text(about_page['content']['rendered'])
+
+        return post_ids, cleaned_text
 
-        return page_ids, cleaned_text
+    def _fetch_post_page(self, route: str, page: int, include_content: bool = False) -> Tuple[List[Dict], int]:
+        """Fetch one page of a post type collection and the collection's total page count"""
+        fields = (
+            "id,link,slug,title.rendered,yoast_head_json.title,yoast_head_json.description,"
+            "yoast_head_json.og_site_name,yoast_head_json.robots"
+        )
+        if include_content:
+            fields += ",content"
+        endpoint = f"{self.wp_site}/wp-json/{route}?per_page=100&page={page}&_fields={fields}"
+        response = self.session.get(endpoint, auth=self.auth, headers=HEADERS, timeout=TIMEOUT)
+        response.raise_for_status()
+        total_pages = int(response.headers.get("X-WP-TotalPages", 1))
+        return response.json(), total_pages
     
     def clean_about_us_text(self, raw_html: str) -> str:
         soup = BeautifulSoup(raw_html, "html.parser")
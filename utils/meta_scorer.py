@@ -0,0 +1,53 @@
+import re
+from collections import Counter
+from typing import Dict, List
+from config import TITLE_LENGTH, DESCRIPTION_LENGTH
+
+MISSING = "missing"
+DUPLICATE = "duplicate"
+TOO_LONG = "too_long"
+TOO_SHORT = "too_short"
+ACCEPTABLE = "acceptable"
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def _is_default_title(post: Dict) -> bool:
+    """Check whether a Yoast title is just the template output: post title, optionally plus separator and site name"""
+    title, post_title = _normalize(post["title"]), _normalize(post.get("post_title", ""))
+    if not post_title:
+        return False
+    if title == post_title:
+        return True
+
+    site_name = _normalize(post.get("site_name", ""))
+    if not site_name:
+        return False
+    return re.fullmatch(rf"{re.escape(post_title)}\s*\S{{1,3}}\s*{re.escape(site_name)}", title) is not None
+
+def score_meta(posts: Dict[str, Dict]) -> Dict[str, str]:
+    """Classify each URL's existing meta title and description"""
+    title_counts = Counter(_normalize(post["title"]) for post in posts.values() if post["title"])
+    description_counts = Counter(_normalize(post["description"]) for post in posts.values() if post["description"])
+
+    statuses = {}
+    for url, post in posts.items():
+        title, description = post["title"].strip(), post["description"].strip()
+
+        if not title or not description or _is_default_title(post):
+            statuses[url] = MISSING
+        elif title_counts[_normalize(title)] > 1 or description_counts[_normalize(description)] > 1:
+            statuses[url] = DUPLICATE
+        elif len(title) > TITLE_LENGTH[1] or len(description) > DESCRIPTION_LENGTH[1]:
+            statuses[url] = TOO_LONG
+        elif len(title) < TITLE_LENGTH[0] or len(description) < DESCRIPTION_LENGTH[0]:
+            statuses[url] = TOO_SHORT
+        else:
+            statuses[url] = ACCEPTABLE
+
+    return statuses
+
+def select_urls_needing_meta(urls: List[str], posts: Dict[str, Dict]) -> List[str]:
+    """Keep only URLs whose existing meta is missing or weak (unmapped URLs count as missing)"""
+    statuses = score_meta({url: posts[url] for url in urls if url in posts})
+    return [url for url in urls if statuses.get(url, MISSING) != ACCEPTABLE]
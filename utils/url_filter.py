@@ -0,0 +1,57 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from config import URL_INCLUDE_PATTERNS, URL_EXCLUDE_PATTERNS, SKIP_NOINDEX
+
+def _compile(patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine regex patterns into a single case-insensitive matcher"""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+def _parse_priority(priority: Optional[str]) -> float:
+    try:
+        return float(priority)
+    except (TypeError, ValueError):
+        return 0.5  # Sitemap protocol default
+
+def _parse_lastmod(lastmod: Optional[str]) -> float:
+    try:
+        return datetime.fromisoformat(lastmod.strip().replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
+
+class UrlFilter:
+    def __init__(self, include_patterns: List[str] = URL_INCLUDE_PATTERNS,
+                 exclude_patterns: List[str] = URL_EXCLUDE_PATTERNS, skip_noindex: bool = SKIP_NOINDEX):
+        self.include = _compile(include_patterns)
+        self.exclude = _compile(exclude_patterns)
+        self.skip_noindex = skip_noindex
+
+    def is_allowed(self, url: str, post: Dict = None) -> bool:
+        """Check a URL path against the include/exclude matchers and its REST noindex flag"""
+        path = urlparse(url).path or "/"
+        if self.include and not self.include.search(path):
+            return False
+        if self.exclude and self.exclude.search(path):
+            return False
+        if self.skip_noindex and post and post.get("noindex"):
+            return False
+        return True
+
+    def apply(self, entries: List[Dict], posts: Dict[str, Dict]) -> Tuple[List[str], List[str]]:
+        """Filter sitemap entries into (allowed URLs ordered by sitemap priority, path depth, then most recent lastmod; excluded URLs)"""
+        allowed, excluded = [], []
+        for entry in entries:
+            if self.is_allowed(entry["url"], posts.get(entry["url"])):
+                allowed.append(entry)
+            else:
+                excluded.append(entry["url"])
+
+        allowed.sort(key=lambda entry: (
+            -_parse_priority(entry.get("priority")),
+            len([part for part in urlparse(entry["url"]).path.split("/") if part]),
+            -_parse_lastmod(entry.get("lastmod"))
+        ))
+        return [entry["url"] for entry in allowed], excluded